@@ -1,24 +1,38 @@
 """Interactive Feedback UI package.
 Provides run_ui entrypoint to show Feedback UI.
 """
+from __future__ import annotations
+
 from importlib import import_module
-from types import ModuleType
-from typing import Optional, List, TypedDict, Tuple, Union
+from typing import TYPE_CHECKING, Any, Optional, List
+
+if TYPE_CHECKING:  # pragma: no cover
+    from feedback_ui import (  # noqa: F401
+        FeedbackResult,
+        FeedbackTextEdit,
+        FeedbackUI,
+        get_dark_mode_palette,
+    )
 
-# Dynamically import original monolithic module to keep backward compatibility
-_original: ModuleType = import_module("feedback_ui")
+# Symbols re-exported from the original monolithic module. It pulls in the
+# whole Qt stack, so it is only imported on first access (PEP 562); using
+# e.g. ``if_ui.helpers`` alone stays cheap.
+_LEGACY_EXPORTS = frozenset({"FeedbackResult", "get_dark_mode_palette", "FeedbackTextEdit", "FeedbackUI"})
 
-FeedbackResult = _original.FeedbackResult  # type: ignore
 
-# Re-export commonly used symbols
-get_dark_mode_palette = _original.get_dark_mode_palette  # type: ignore
-FeedbackTextEdit = _original.FeedbackTextEdit  # type: ignore
-FeedbackUI = _original.FeedbackUI  # type: ignore
+def __getattr__(name: str) -> Any:
+    if name in _LEGACY_EXPORTS:
+        value = getattr(import_module("feedback_ui"), name)
+        globals()[name] = value  # cache: later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Public API
 
-def run_ui(prompt: str, predefined_options: Optional[List[str]] | None = None) -> FeedbackResult:  # type: ignore
+def run_ui(prompt: str, predefined_options: Optional[List[str]] | None = None) -> FeedbackResult | None:
     """Wrapper around original feedback_ui.feedback_ui to preserve behaviour.
     This enables future refactor: internal implementation can move while external call sites stay the same.
     """
-    return _original.feedback_ui(prompt, predefined_options)
+    from feedback_ui import feedback_ui
+
+    return feedback_ui(prompt, predefined_options)
@@ -9,23 +9,36 @@ from __future__ import annotations
 import html
 import json
 import re
+from functools import lru_cache
 from typing import Final
 
+try:  # optional dependency – plain-text fallback when missing
+    import markdown as _markdown
+except ModuleNotFoundError:  # pragma: no cover
+    _markdown = None  # type: ignore[assignment]
+
 __all__ = [
     "preprocess_text",
     "is_markdown",
+    "is_plain_text",
+    "preprocess_and_classify",
     "convert_text_to_html",
     "convert_markdown_to_html",
+    "preprocessed_text_to_html",
+    "preprocessed_markdown_to_html",
 ]
 
 
 _ESCAPE_REPLACEMENTS: Final[dict[str, str]] = {
     "\\n": "\n",
     "\\t": "\t",
-    "\\r": "\r",
     "\\\\": "\\",
 }
 
+# Literal escapes plus every CR / CRLF flavour (real or escaped), resolved in
+# one left-to-right pass. Anything not in _ESCAPE_REPLACEMENTS is a newline.
+_ESCAPE_RE: Final[re.Pattern[str]] = re.compile(r"(?:\\r|\r)(?:\\n|\n)?|\\[nt\\]")
+
 
 # ---------------------------------------------------------------------------
 # Basic text pre-processing (deal with double-escaped sequences from JSON / CLI)
@@ -35,21 +48,34 @@ def preprocess_text(text: str) -> str:
     """Best-effort clean-up of incoming *text* before further processing."""
     if not isinstance(text, str):
         return text  # type: ignore[return-value]
-
-    # Try JSON decode first – handles strings like '"line\nline"'
-    try:
-        decoded = json.loads(text)
-        if isinstance(decoded, str):
-            text = decoded
-    except Exception:  # noqa: BLE001 – permissive by design
-        pass
-
-    # Replace common escape sequences
-    for src, dst in _ESCAPE_REPLACEMENTS.items():
-        text = text.replace(src, dst)
-
-    # Normalise newlines
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return _preprocess_text_cached(text)
+
+
+@lru_cache(maxsize=256)
+def _preprocess_text_cached(text: str) -> str:
+    # Pure function of *text*: the same prompt is usually run through
+    # is_markdown() and then convert_*_to_html(), so memoise it.
+    # Try JSON decode first – handles strings like '"line\nline"'. Only a
+    # quoted string can decode to str, so skip the raise/catch for prose.
+    if text.lstrip().startswith('"'):
+        try:
+            decoded = json.loads(text)
+            if isinstance(decoded, str):
+                text = decoded
+        except ValueError:  # json.JSONDecodeError – not JSON after all
+            pass
+
+    # Replace common escape sequences and normalise newlines. Most text has no
+    # backslash at all and only needs the cheap C-level membership checks.
+    if "\\" in text:
+        if "\\\\" in text:
+            # Escaped backslashes make replacement order matter: resolve left
+            # to right (costs a Python callback per match).
+            return _ESCAPE_RE.sub(lambda m: _ESCAPE_REPLACEMENTS.get(m.group(), "\n"), text)
+        # Escapes cannot overlap here, so plain str.replace gives the same result.
+        text = text.replace("\\n", "\n").replace("\\t", "\t").replace("\\r", "\r")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
     return text
 
 
@@ -57,33 +83,66 @@ def preprocess_text(text: str) -> str:
 # Markdown detection helpers (heuristic)
 # ---------------------------------------------------------------------------
 
-_MD_PATTERNS: Final[list[str]] = [
-    r"^#{1,6}\s+.+",  # headings
-    r"\*\*.+?\*\*",  # bold
-    r"\*.+?\*",  # italic *text*
-    r"_.+?_",  # italic _text_
-    r"`[^`]+`",  # inline code
-    r"^\s*```",  # fenced code block
-    r"^\s*>",  # blockquote
-    r"^\s*[-*+]\s+",  # unordered list
-    r"^\s*\d+\.\s+",  # ordered list
-]
+_MD_PATTERN_SOURCES: Final[tuple[str, ...]] = (
+    r"\n#{1,6}[^\S\n]+.",  # headings
+    r"\*\*[^*\n]+\*\*",  # bold
+    r"\*[^*\n]+\*",  # italic *text*
+    r"_[^_\n]+_",  # italic _text_
+    r"`[^`\n]+`",  # inline code
+    r"\n[^\S\n]*```",  # fenced code block
+    r"\n[^\S\n]*>",  # blockquote
+    r"\n[^\S\n]*[-*+][^\S\n]+",  # unordered list
+    r"\n[^\S\n]*[0-9]+\.[^\S\n]+",  # ordered list
+)
+
+# All heuristics folded into one alternation that is run over the whole
+# buffer. Line-start patterns match the "\n" opening their line instead of
+# using "^", so every branch begins with a literal and re can skip ahead with
+# its C-level prefix scan; the buffer is searched with a leading "\n" so the
+# first line is covered. Patterns never reach the "\n" ending a line
+# ("[^\S\n]" is whitespace minus newline).
+_MD_RE: Final[re.Pattern[str]] = re.compile("|".join(f"(?:{pat})" for pat in _MD_PATTERN_SOURCES))
+
+# Every pattern above needs at least one of these; plain prose usually has none.
+_MD_SIGILS: Final[str] = "#*_`>+-0123456789"
+
+# ...plus what preprocess_text() reacts to (a JSON string must start with a quote).
+_PLAIN_TEXT_BLOCKERS: Final[str] = _MD_SIGILS + '\\"\r'
 
 
 def is_markdown(text: str) -> bool:
     """Heuristic check if *text* likely contains Markdown."""
+    return _is_markdown_core(preprocess_text(text))
+
+
+def is_plain_text(text: str) -> bool:
+    """True if *text* is unchanged by preprocess_text() and cannot be Markdown."""
+    return not any(ch in text for ch in _PLAIN_TEXT_BLOCKERS)
+
+
+def preprocess_and_classify(text: str) -> tuple[str, bool]:
+    """Return ``(preprocess_text(text), is_markdown(text))`` in one pass."""
     text = preprocess_text(text)
-    if not text.strip():
+    return text, _is_markdown_core(text)
+
+
+def _is_markdown_core(text: str) -> bool:
+    # is_markdown() for text that has already been through preprocess_text().
+    if not text.strip() or not any(ch in text for ch in _MD_SIGILS):
         return False
 
-    lines = text.split("\n")
-    features = 0
-    for line in lines:
-        for pat in _MD_PATTERNS:
-            if re.search(pat, line):
-                features += 1
-                break
-    return features >= 2 or (features and features / len(lines) > 0.1)
+    # Markdown means >= 2 feature lines, or feature lines above 10% of all
+    # lines. A single feature line only clears that ratio below ten lines, so
+    # at most two searches are needed: the first hit, then any hit on a later
+    # line (matches never span "\n").
+    padded = "\n" + text
+    first = _MD_RE.search(padded)
+    if first is None:
+        return False
+    if text.count("\n") + 1 < 10:
+        return True
+    line_end = padded.find("\n", first.end())
+    return line_end >= 0 and _MD_RE.search(padded, line_end) is not None
 
 
 # ---------------------------------------------------------------------------
@@ -92,24 +151,42 @@ def is_markdown(text: str) -> bool:
 
 def convert_text_to_html(text: str) -> str:
     """Escape *text* → minimal HTML preserving newlines."""
-    text = preprocess_text(text)
-    escaped = html.escape(text)
-    return escaped.replace("\n", "<br>")
+    return preprocessed_text_to_html(preprocess_text(text))
 
 
 def convert_markdown_to_html(markdown_text: str) -> str:  # noqa: D401 – descriptive
     """Convert *markdown_text* to HTML with *markdown* library if available."""
-    markdown_text = preprocess_text(markdown_text)
-    try:
-        import markdown  # heavyweight import guarded
-
-        html_out = markdown.markdown(
-            markdown_text,
-            extensions=["extra", "codehilite", "toc"],
-        )
-        return html_out
-    except ModuleNotFoundError:
+    return preprocessed_markdown_to_html(preprocess_text(markdown_text))
+
+
+def preprocessed_text_to_html(text: str) -> str:
+    """convert_text_to_html() for text that has already been through preprocess_text()."""
+    # Output is element content, never an attribute value, so quotes can stay
+    # literal: quote=False skips two of html.escape()'s five passes.
+    escaped = html.escape(text, quote=False)
+    return escaped.replace("\n", "<br>")
+
+
+def preprocessed_markdown_to_html(markdown_text: str) -> str:
+    """convert_markdown_to_html() for text that has already been through preprocess_text()."""
+    if _markdown is None:
         # Fallback: plain escape
-        return convert_text_to_html(markdown_text)
+        return preprocessed_text_to_html(markdown_text)
+    try:
+        return _render_markdown(markdown_text)
     except Exception:  # noqa: BLE001 – graceful degradation
-        return convert_text_to_html(markdown_text)
+        return preprocessed_text_to_html(markdown_text)
+
+
+@lru_cache(maxsize=128)
+def _render_markdown(markdown_text: str) -> str:
+    # codehilite/Pygments dominate render time; identical prompts are common.
+    # reset() clears per-document state (footnotes, toc, ...) between calls.
+    return _markdown_converter().reset().convert(markdown_text)
+
+
+@lru_cache(maxsize=1)
+def _markdown_converter() -> _markdown.Markdown:
+    # Building a Markdown instance wires up every extension and compiles
+    # their patterns; do it once, on first render rather than at import.
+    return _markdown.Markdown(extensions=["extra", "codehilite", "toc"])
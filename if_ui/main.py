@@ -4,6 +4,11 @@ Later commits will gradually migrate the full `FeedbackUI` here.
 """
 from __future__ import annotations
 
+import binascii
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -40,19 +45,384 @@ from PySide6.QtWidgets import (
     QRadioButton,
     QSpacerItem,
 )
-from PySide6.QtGui import QIcon, QKeySequence, QAction, QPixmap, QShortcut, QFont
-from PySide6.QtCore import Qt, QSettings, QSize
+from PySide6.QtGui import QIcon, QKeySequence, QAction, QImage, QPixmap, QPixmapCache, QFont, QImageReader
+from PySide6.QtCore import Qt, QSettings, QSize, QBuffer, QEventLoop, QIODevice, QObject, QRunnable, QThreadPool, Signal
 
 from .widgets import FeedbackTextEdit
-from .theme import get_dark_mode_palette, ModernTheme, ComponentStyles
+from . import theme as _theme
+from .theme import get_dark_mode_palette, ModernTheme
 from .helpers import (
+    is_plain_text,
     preprocess_text,
-    is_markdown,
-    convert_text_to_html,
-    convert_markdown_to_html,
+    preprocess_and_classify,
+    preprocessed_markdown_to_html,
+    preprocessed_text_to_html,
 )
 
 
+# ---------------------------------------------------------------------------
+# Stylesheets – ModernTheme is static, so build every QSS string once at import
+# ---------------------------------------------------------------------------
+
+_WINDOW_QSS = f"""
+    QMainWindow#feedbackWindow {{
+        background-color: {ModernTheme.BG_PRIMARY.name()};
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+    }}
+"""
+
+_HEADER_QSS = f"""
+    QFrame#header {{
+        background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
+                   stop: 0 {ModernTheme.PRIMARY.name()},
+                   stop: 1 {ModernTheme.PRIMARY.darker(120).name()});
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+        margin-bottom: 0px;
+    }}
+"""
+
+_TITLE_LABEL_QSS = """
+    QLabel#headerTitle {
+        color: white;
+        font-weight: bold;
+    }
+"""
+
+_VERSION_LABEL_QSS = f"""
+    QLabel#versionLabel {{
+        color: {ModernTheme.TEXT_SECONDARY.name()};
+        background: rgba(255, 255, 255, 0.15);
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+        padding: 2px 6px;
+        font-size: 11px;
+        font-weight: 500;
+    }}
+"""
+
+_OPTIONS_GROUP_QSS = f"""
+    QGroupBox#optionsGroup {{
+        font-size: 13px;
+        font-weight: 600;
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+        margin-top: {ModernTheme.SPACING_SM}px;
+        padding-top: {ModernTheme.SPACING_SM}px;
+        background: {ModernTheme.BG_SECONDARY.name()};
+    }}
+    QGroupBox#optionsGroup::title {{
+        subcontrol-origin: margin;
+        left: {ModernTheme.SPACING_MD}px;
+        padding: 0 {ModernTheme.SPACING_SM}px 0 {ModernTheme.SPACING_SM}px;
+        background: {ModernTheme.BG_PRIMARY.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+    }}
+    QGroupBox#optionsGroup QCheckBox {{
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        font-size: 13px;
+        font-weight: 500;
+        spacing: {ModernTheme.SPACING_SM}px;
+        padding: {ModernTheme.SPACING_XS}px 0px;
+    }}
+    QGroupBox#optionsGroup QCheckBox::indicator {{
+        width: 16px;
+        height: 16px;
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+        border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
+        background: {ModernTheme.BG_CARD.name()};
+        margin-right: {ModernTheme.SPACING_SM}px;
+    }}
+    QGroupBox#optionsGroup QCheckBox::indicator:hover {{
+        border-color: {ModernTheme.BORDER_HOVER.name()};
+        background: {ModernTheme.BG_TERTIARY.name()};
+    }}
+    QGroupBox#optionsGroup QCheckBox::indicator:checked {{
+        background: {ModernTheme.PRIMARY.name()};
+        border-color: {ModernTheme.PRIMARY.name()};
+    }}
+"""
+
+_FEEDBACK_GROUP_QSS = f"""
+    QGroupBox#feedbackGroup {{
+        font-size: 14px;
+        font-weight: 700;
+        color: {ModernTheme.PRIMARY.name()};
+        border: none;  /* 完全移除边框 */
+        border-radius: 0px;
+        margin-top: {ModernTheme.SPACING_MD}px;
+        padding-top: {ModernTheme.SPACING_MD}px;
+        background: transparent;  /* 透明背景 */
+    }}
+    QGroupBox#feedbackGroup::title {{
+        subcontrol-origin: margin;
+        left: 0px;
+        padding: 0 {ModernTheme.SPACING_SM}px 0 0px;
+        background: transparent;
+        border-radius: 0px;
+    }}
+"""
+
+_FEEDBACK_TEXT_QSS = f"""
+    QTextEdit#feedbackText {{
+        background-color: {ModernTheme.BG_CARD.name()};
+        border: 2px solid {ModernTheme.PRIMARY.name()};  /* 恢复主要边框 */
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+        padding: {ModernTheme.SPACING_MD}px;
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        font-size: 14px;
+        line-height: 1.5;
+        selection-background-color: {ModernTheme.PRIMARY.name()};
+    }}
+    QTextEdit#feedbackText:focus {{
+        background-color: {ModernTheme.BG_CARD.lighter(110).name()};
+        border-color: {ModernTheme.PRIMARY.lighter(120).name()};
+    }}
+    QTextEdit#feedbackText:hover {{
+        border-color: {ModernTheme.PRIMARY.lighter(110).name()};
+    }}
+"""
+
+_SESSION_GROUP_QSS = f"""
+    QGroupBox#sessionGroup {{
+        font-size: 13px;
+        font-weight: 600;
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+        margin-top: {ModernTheme.SPACING_SM}px;
+        padding-top: {ModernTheme.SPACING_MD}px;  /* 增加顶部padding */
+        background: {ModernTheme.BG_SECONDARY.name()};
+    }}
+    QGroupBox#sessionGroup::title {{
+        subcontrol-origin: margin;
+        left: {ModernTheme.SPACING_MD}px;
+        padding: 0 {ModernTheme.SPACING_SM}px 0 {ModernTheme.SPACING_SM}px;
+        background: {ModernTheme.BG_PRIMARY.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+    }}
+"""
+
+_RADIO_QSS = f"""
+    QRadioButton#sessionRadio {{
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        font-size: 14px;
+        font-weight: 600;
+        spacing: {ModernTheme.SPACING_MD}px;
+        padding: {ModernTheme.SPACING_SM}px;
+        min-height: 24px;  /* 确保最小高度 */
+    }}
+    QRadioButton#sessionRadio::indicator {{
+        width: 18px;
+        height: 18px;
+        border-radius: 9px;
+        border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
+        background: {ModernTheme.BG_CARD.name()};
+        margin-right: {ModernTheme.SPACING_MD}px;
+    }}
+    QRadioButton#sessionRadio::indicator:hover {{
+        border-color: {ModernTheme.PRIMARY.name()};
+        background: {ModernTheme.BG_TERTIARY.name()};
+    }}
+    QRadioButton#sessionRadio::indicator:checked {{
+        background: {ModernTheme.PRIMARY.name()};
+        border-color: {ModernTheme.PRIMARY.name()};
+    }}
+"""
+
+_IMAGES_CONTAINER_QSS = f"""
+    QWidget#imagesContainer {{
+        background: {ModernTheme.BG_CARD.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+    }}
+"""
+
+_BUTTON_FRAME_QSS = f"""
+    QFrame#buttonBar {{
+        background: {ModernTheme.BG_SECONDARY.name()};
+        border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS}px;
+        padding: {ModernTheme.SPACING_MD}px;
+    }}
+"""
+
+_STATUS_FRAME_QSS = f"""
+    QFrame#statusBar {{
+        background: transparent;
+        border-top: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+        padding-top: {ModernTheme.SPACING_SM}px;
+    }}
+"""
+
+_SHORTCUTS_LABEL_QSS = f"""
+    QLabel#shortcutsLabel {{
+        color: {ModernTheme.TEXT_MUTED.name()};
+        font-size: 11px;
+    }}
+"""
+
+_CREDIT_LABEL_QSS = f"""
+    QLabel#creditLabel {{
+        color: {ModernTheme.TEXT_MUTED.name()};
+        font-size: 10px;
+    }}
+"""
+
+_IMAGE_FRAME_QSS = f"""
+    QFrame#imageFrame {{
+        background: {ModernTheme.BG_TERTIARY.name()};
+        border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+        padding: 4px;
+    }}
+    QFrame#imageFrame:hover {{
+        border-color: {ModernTheme.BORDER_HOVER.name()};
+    }}
+"""
+
+_DELETE_BUTTON_QSS = f"""
+    QToolButton#deleteImageButton {{
+        background: {ModernTheme.ERROR.name()};
+        color: white;
+        border: none;
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+        font-size: 10px;
+        max-width: 20px;
+        max-height: 16px;
+    }}
+    QToolButton#deleteImageButton:hover {{
+        background: {ModernTheme.ERROR.darker(120).name()};
+    }}
+"""
+
+_TOOLTIP_QSS = f"""
+    QToolTip {{
+        background-color: {ModernTheme.BG_TERTIARY.name()};
+        color: {ModernTheme.TEXT_PRIMARY.name()};
+        border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+        border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
+        padding: 4px;
+        font-size: 12px;
+    }}
+"""
+
+
+# One sheet for the whole application: Qt parses it once and every widget
+# picks its rules by objectName, instead of each widget carrying (and
+# re-polishing) its own sheet. Joined on each call so a THEME_QSS rebuilt by
+# theme.rebuild_theme_qss() is picked up.
+def _app_qss() -> str:
+    return "".join((
+        _theme.THEME_QSS,  # 通用组件样式在前，下面的 ID 规则覆盖它
+        _WINDOW_QSS,
+        _HEADER_QSS,
+        _TITLE_LABEL_QSS,
+        _VERSION_LABEL_QSS,
+        _OPTIONS_GROUP_QSS,
+        _FEEDBACK_GROUP_QSS,
+        _FEEDBACK_TEXT_QSS,
+        _SESSION_GROUP_QSS,
+        _RADIO_QSS,
+        _IMAGES_CONTAINER_QSS,
+        _BUTTON_FRAME_QSS,
+        _STATUS_FRAME_QSS,
+        _SHORTCUTS_LABEL_QSS,
+        _CREDIT_LABEL_QSS,
+        _IMAGE_FRAME_QSS,
+        _DELETE_BUTTON_QSS,
+        _TOOLTIP_QSS,
+    ))
+
+
+# 可直接透传原始文件字节的图片格式 (QImageReader 按文件内容识别的格式名)
+_PASSTHROUGH_IMAGE_FORMATS = frozenset({"png", "jpeg", "gif", "webp"})
+
+
+@lru_cache(maxsize=1)
+def _window_icon() -> QIcon:
+    """窗口图标 – 只从磁盘读取一次，后续窗口复用同一个 QIcon"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return QIcon(os.path.join(script_dir, "..", "images", "feedback.png"))
+
+
+@lru_cache(maxsize=1)
+def _base_font() -> QFont:
+    """全局基础字体 (只解析一次字体回退列表)；调用方应复制后再修改: QFont(_base_font())"""
+    font = QFont()
+    font.setFamilies(["system-ui", "-apple-system", "BlinkMacSystemFont", "Segoe UI", "Roboto"])
+    font.setStyleHint(QFont.SansSerif)
+    return font
+
+
+class _ImageLoadBatch:
+    """一次文件选择的加载结果 – 工作线程完成顺序不定，按选择顺序交付"""
+
+    _PENDING = object()
+
+    def __init__(self, size: int):
+        self.results: list = [self._PENDING] * size
+        self.next_index = 0
+
+    def set_result(self, index: int, result) -> list:
+        """记录第 *index* 个文件的结果，返回此刻已可按顺序交付的结果 (失败为 None)"""
+        self.results[index] = result
+        ready = []
+        while self.next_index < len(self.results) and self.results[self.next_index] is not self._PENDING:
+            ready.append(self.results[self.next_index])
+            self.results[self.next_index] = None  # 已交付，释放数据
+            self.next_index += 1
+        return ready
+
+
+class _ImageLoadSignals(QObject):
+    """_ImageLoadWorker 的信号 (QRunnable 不是 QObject)"""
+
+    loaded = Signal(object, int, object, QImage)  # 批次, 序号, 图片数据记录 (失败为 None), 64px 缩略图
+
+
+class _ImageLoadWorker(QRunnable):
+    """在线程池中读取并编码一张图片；只用 QImage，QPixmap 不能离开 GUI 线程"""
+
+    def __init__(self, file_path: str, batch: _ImageLoadBatch, index: int):
+        super().__init__()
+        self.file_path = file_path
+        self.batch = batch
+        self.index = index
+        self.signals = _ImageLoadSignals()
+
+    def run(self):
+        # 失败也要发信号，否则同一批次中后面的图片会一直等待
+        record, thumbnail = None, QImage()
+        try:
+            reader = QImageReader(self.file_path)
+            image_format = bytes(reader.format()).decode("ascii")
+            image = reader.read()
+            if image.isNull():
+                print(f"加载图片失败 {self.file_path}: {reader.errorString()}")
+            else:
+                # 常见格式直接用文件原始字节，其余格式 (bmp 等) 才重新编码为 PNG
+                if image_format in _PASSTHROUGH_IMAGE_FORMATS:
+                    raw = Path(self.file_path).read_bytes()
+                else:
+                    buffer = QBuffer()
+                    buffer.open(QIODevice.WriteOnly)
+                    image.save(buffer, "PNG")
+                    buffer.close()
+                    raw = buffer.data()
+                    image_format = "png"
+
+                record = {
+                    # b2a_base64 是 b64encode 底层的 C 实现，省去一层包装与中间对象
+                    'base64': binascii.b2a_base64(raw, newline=False).decode('ascii'),
+                    'filename': os.path.basename(self.file_path),
+                    'format': image_format,
+                }
+                thumbnail = image.scaled(64, 64, Qt.KeepAspectRatio, Qt.FastTransformation)
+        except Exception as e:
+            record = None
+            print(f"加载图片失败 {self.file_path}: {e}")
+        self.signals.loaded.emit(self.batch, self.index, record, thumbnail)
+
+
 class FeedbackUI(QMainWindow):
     """现代化的交互式反馈UI界面"""
 
@@ -62,29 +432,23 @@ class FeedbackUI(QMainWindow):
         self.predefined_options = predefined_options or []
 
         self.feedback_result = None  # will be set on submit
+        self._event_loop: QEventLoop | None = None  # run() 期间的局部事件循环
         self.setWindowTitle("🚀 Cursor 智能交互反馈助手")
         
         # 设置窗口图标
-        script_dir = __import__("os").path.dirname(__import__("os").path.abspath(__file__))
-        icon_path = __import__("os").path.join(script_dir, "..", "images", "feedback.png")
-        self.setWindowIcon(QIcon(icon_path))
+        self.setWindowIcon(_window_icon())
         
         # 窗口属性设置
         self.setWindowFlags(self.windowFlags() | Qt.WindowStaysOnTopHint)
         
         # 设置主题样式表
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {ModernTheme.BG_PRIMARY.name()};
-                color: {ModernTheme.TEXT_PRIMARY.name()};
-            }}
-        """)
+        self.setObjectName("feedbackWindow")
 
         # Settings storage
         self.settings = QSettings("InteractiveFeedbackMCP", "InteractiveFeedbackMCP")
 
-        # Store image preview frames
-        self.image_frames: list[QFrame] = []
+        # 图片预览框架 → 对应的图片数据记录 (feedback_text.image_data 中的同一个 dict)
+        self.image_records: dict[QFrame, dict[str, str]] = {}
 
         # UI init
         self._create_ui()
@@ -95,9 +459,14 @@ class FeedbackUI(QMainWindow):
         # Connect image pasted signal
         self.feedback_text.image_pasted.connect(self._on_image_pasted)
 
+        # 界面构建完成，恢复更新 (见 _create_ui)
+        self.centralWidget().setUpdatesEnabled(True)
+
     def _create_ui(self):
         """创建现代化的用户界面 - 优化布局突出主要功能"""
         central_widget = QWidget()
+        # 构建期间暂停更新，__init__ 末尾统一恢复
+        central_widget.setUpdatesEnabled(False)
         self.setCentralWidget(central_widget)
         
         # 主布局 - 增加合理间距
@@ -138,15 +507,7 @@ class FeedbackUI(QMainWindow):
         """创建紧凑但美观的标题区域"""
         header_frame = QFrame()
         header_frame.setFixedHeight(50)  # 固定合理高度
-        header_frame.setStyleSheet(f"""
-            QFrame {{
-                background: qlineargradient(x1: 0, y1: 0, x2: 1, y2: 0,
-                           stop: 0 {ModernTheme.PRIMARY.name()}, 
-                           stop: 1 {ModernTheme.PRIMARY.darker(120).name()});
-                border-radius: {ModernTheme.BORDER_RADIUS}px;
-                margin-bottom: 0px;
-            }}
-        """)
+        header_frame.setObjectName("header")
         
         header_layout = QHBoxLayout(header_frame)
         header_layout.setContentsMargins(ModernTheme.SPACING_MD, ModernTheme.SPACING_SM, 
@@ -154,23 +515,15 @@ class FeedbackUI(QMainWindow):
         
         # 标题标签
         title_label = QLabel("💬 智能交互反馈")
-        title_font = QFont()
-        title_font.setFamily("system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif")
+        title_font = QFont(_base_font())
         title_font.setPointSize(15)  # 适中的字体大小
         title_font.setWeight(QFont.Bold)
         title_label.setFont(title_font)
-        title_label.setStyleSheet("color: white; font-weight: bold;")
+        title_label.setObjectName("headerTitle")
         
         # 版本标签
         version_label = QLabel("v2.0")
-        version_label.setStyleSheet(f"""
-            color: {ModernTheme.TEXT_SECONDARY.name()};
-            background: rgba(255, 255, 255, 0.15);
-            border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-            padding: 2px 6px;
-            font-size: 11px;
-            font-weight: 500;
-        """)
+        version_label.setObjectName("versionLabel")
         
         header_layout.addWidget(title_label)
         header_layout.addStretch()
@@ -182,13 +535,14 @@ class FeedbackUI(QMainWindow):
         """创建描述文本区域 - 紧凑但清晰"""
         self.description_text = QTextBrowser()
         
-        # 处理文本内容
-        processed = preprocess_text(self.prompt)
-        html = (
-            convert_markdown_to_html(processed)
-            if is_markdown(processed)
-            else convert_text_to_html(processed)
-        )
+        # 处理文本内容 – 常见的纯文本提示直接转义，跳过预处理与 Markdown 检测
+        if is_plain_text(self.prompt):
+            html = preprocessed_text_to_html(self.prompt)
+        else:
+            # 与原实现一致预处理两遍 (双重转义的提示需要第二遍)，
+            # 检测与渲染使用同一份文本
+            processed, is_md = preprocess_and_classify(preprocess_text(self.prompt))
+            html = preprocessed_markdown_to_html(processed) if is_md else preprocessed_text_to_html(processed)
         self.description_text.setHtml(html)
         
         # 设置属性 - 优化高度分配
@@ -198,32 +552,14 @@ class FeedbackUI(QMainWindow):
         self.description_text.setMinimumHeight(80)   # 减少最小高度
         
         # 应用现代化样式
-        self.description_text.setStyleSheet(ComponentStyles.modern_text_browser())
+        self.description_text.setObjectName("description")
         
         layout.addWidget(self.description_text)
 
     def _create_options_area(self, layout):
         """创建紧凑的预设选项区域"""
         options_group = QGroupBox("🎯 快速选项")
-        options_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 13px;
-                font-weight: 600;
-                color: {ModernTheme.TEXT_PRIMARY.name()};
-                border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS}px;
-                margin-top: {ModernTheme.SPACING_SM}px;
-                padding-top: {ModernTheme.SPACING_SM}px;
-                background: {ModernTheme.BG_SECONDARY.name()};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: {ModernTheme.SPACING_MD}px;
-                padding: 0 {ModernTheme.SPACING_SM}px 0 {ModernTheme.SPACING_SM}px;
-                background: {ModernTheme.BG_PRIMARY.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-            }}
-        """)
+        options_group.setObjectName("optionsGroup")
         
         # 垂直布局，紧凑排列
         group_layout = QVBoxLayout(options_group)
@@ -235,32 +571,6 @@ class FeedbackUI(QMainWindow):
         self.option_checkboxes: list[QCheckBox] = []
         for opt in self.predefined_options:
             cb = QCheckBox(opt)
-            cb.setStyleSheet(f"""
-            QCheckBox {{
-                color: {ModernTheme.TEXT_PRIMARY.name()};
-                font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                font-size: 13px;
-                font-weight: 500;
-                spacing: {ModernTheme.SPACING_SM}px;
-                padding: {ModernTheme.SPACING_XS}px 0px;
-            }}
-            QCheckBox::indicator {{
-                width: 16px;
-                height: 16px;
-                border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-                border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
-                background: {ModernTheme.BG_CARD.name()};
-                margin-right: {ModernTheme.SPACING_SM}px;
-            }}
-            QCheckBox::indicator:hover {{
-                border-color: {ModernTheme.BORDER_HOVER.name()};
-                background: {ModernTheme.BG_TERTIARY.name()};
-            }}
-            QCheckBox::indicator:checked {{
-                background: {ModernTheme.PRIMARY.name()};
-                border-color: {ModernTheme.PRIMARY.name()};
-            }}
-            """)
             self.option_checkboxes.append(cb)
             group_layout.addWidget(cb)
         
@@ -269,25 +579,7 @@ class FeedbackUI(QMainWindow):
     def _create_feedback_area(self, layout):
         """创建反馈输入区域 - 彻底解决双边框问题"""
         feedback_group = QGroupBox("✍️ 详细反馈 (主要功能)")
-        feedback_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: 700;
-                color: {ModernTheme.PRIMARY.name()};
-                border: none;  /* 完全移除边框 */
-                border-radius: 0px;
-                margin-top: {ModernTheme.SPACING_MD}px;
-                padding-top: {ModernTheme.SPACING_MD}px;
-                background: transparent;  /* 透明背景 */
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 0px;
-                padding: 0 {ModernTheme.SPACING_SM}px 0 0px;
-                background: transparent;
-                border-radius: 0px;
-            }}
-        """)
+        feedback_group.setObjectName("feedbackGroup")
         
         group_layout = QVBoxLayout(feedback_group)
         group_layout.setContentsMargins(0, ModernTheme.SPACING_SM, 0, 0)  # 只保留顶部间距
@@ -300,26 +592,7 @@ class FeedbackUI(QMainWindow):
         self.feedback_text.setMaximumHeight(200)
         
         # 应用现代化样式 - TextEdit作为主要的视觉容器
-        self.feedback_text.setStyleSheet(f"""
-        QTextEdit {{
-            background-color: {ModernTheme.BG_CARD.name()};
-            border: 2px solid {ModernTheme.PRIMARY.name()};  /* 恢复主要边框 */
-            border-radius: {ModernTheme.BORDER_RADIUS}px;
-            padding: {ModernTheme.SPACING_MD}px;
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, monospace;
-            font-size: 14px;
-            line-height: 1.5;
-            selection-background-color: {ModernTheme.PRIMARY.name()};
-        }}
-        QTextEdit:focus {{
-            background-color: {ModernTheme.BG_CARD.lighter(110).name()};
-            border-color: {ModernTheme.PRIMARY.lighter(120).name()};
-        }}
-        QTextEdit:hover {{
-            border-color: {ModernTheme.PRIMARY.lighter(110).name()};
-        }}
-        """)
+        self.feedback_text.setObjectName("feedbackText")
         
         group_layout.addWidget(self.feedback_text)
         layout.addWidget(feedback_group)
@@ -327,25 +600,7 @@ class FeedbackUI(QMainWindow):
     def _create_session_control(self, layout):
         """创建清晰的会话控制区域 - 修复字体遮挡问题"""
         session_group = QGroupBox("🔄 会话控制")
-        session_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 13px;
-                font-weight: 600;
-                color: {ModernTheme.TEXT_PRIMARY.name()};
-                border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS}px;
-                margin-top: {ModernTheme.SPACING_SM}px;
-                padding-top: {ModernTheme.SPACING_MD}px;  /* 增加顶部padding */
-                background: {ModernTheme.BG_SECONDARY.name()};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: {ModernTheme.SPACING_MD}px;
-                padding: 0 {ModernTheme.SPACING_SM}px 0 {ModernTheme.SPACING_SM}px;
-                background: {ModernTheme.BG_PRIMARY.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-            }}
-        """)
+        session_group.setObjectName("sessionGroup")
         session_group.setFixedHeight(90)  # 增加高度从70到90
         
         sess_layout = QHBoxLayout(session_group)
@@ -353,40 +608,12 @@ class FeedbackUI(QMainWindow):
                                      ModernTheme.SPACING_LG, ModernTheme.SPACING_MD)  # 增加顶部内边距
         sess_layout.setSpacing(ModernTheme.SPACING_XL)  # 适中的按钮间距
         
-        # 单选按钮样式 - 确保文字完全显示
-        radio_style = f"""
-        QRadioButton {{
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            font-size: 14px;
-            font-weight: 600;
-            spacing: {ModernTheme.SPACING_MD}px;
-            padding: {ModernTheme.SPACING_SM}px;
-            min-height: 24px;  /* 确保最小高度 */
-        }}
-        QRadioButton::indicator {{
-            width: 18px;
-            height: 18px;
-            border-radius: 9px;
-            border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
-            background: {ModernTheme.BG_CARD.name()};
-            margin-right: {ModernTheme.SPACING_MD}px;
-        }}
-        QRadioButton::indicator:hover {{
-            border-color: {ModernTheme.PRIMARY.name()};
-            background: {ModernTheme.BG_TERTIARY.name()};
-        }}
-        QRadioButton::indicator:checked {{
-            background: {ModernTheme.PRIMARY.name()};
-            border-color: {ModernTheme.PRIMARY.name()};
-        }}
-        """
         
         self.rb_continue = QRadioButton("📝 继续会话")
         self.rb_terminate = QRadioButton("🔚 终止会话")
         
-        self.rb_continue.setStyleSheet(radio_style)
-        self.rb_terminate.setStyleSheet(radio_style)
+        self.rb_continue.setObjectName("sessionRadio")
+        self.rb_terminate.setObjectName("sessionRadio")
         self.rb_continue.setChecked(True)
         
         sess_layout.addWidget(self.rb_continue)
@@ -396,22 +623,24 @@ class FeedbackUI(QMainWindow):
         layout.addWidget(session_group)
 
     def _create_image_preview_area(self, layout):
-        """创建紧凑的图片预览区域"""
+        """预留图片预览区域的位置 – 多数会话不附图，控件在第一次添加图片时才创建"""
+        self.scroll_area: QScrollArea | None = None
+        self._preview_layout = layout
+        self._preview_index = layout.count()
+
+    def _ensure_image_preview_area(self) -> QScrollArea:
+        """创建紧凑的图片预览区域 (仅首次调用时)，返回其滚动区域"""
+        if self.scroll_area is not None:
+            return self.scroll_area
         # 图片预览滚动区域
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setVisible(False)  # 默认隐藏
-        self.scroll_area.setFrameShape(QFrame.NoFrame)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setFixedHeight(80)  # 从100减小到80
-        self.scroll_area.setStyleSheet(ComponentStyles.modern_scroll_area())
+        scroll_area = QScrollArea()
+        scroll_area.setFrameShape(QFrame.NoFrame)
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFixedHeight(80)  # 从100减小到80
+        scroll_area.setObjectName("imageScroll")
 
         self.images_container = QWidget()
-        self.images_container.setStyleSheet(f"""
-            QWidget {{
-                background: {ModernTheme.BG_CARD.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS}px;
-            }}
-        """)
+        self.images_container.setObjectName("imagesContainer")
         
         self.images_layout = QHBoxLayout(self.images_container)
         self.images_layout.setContentsMargins(ModernTheme.SPACING_XS, ModernTheme.SPACING_XS, 
@@ -419,20 +648,15 @@ class FeedbackUI(QMainWindow):
         self.images_layout.setSpacing(ModernTheme.SPACING_XS)
         self.images_layout.addStretch(1)
 
-        self.scroll_area.setWidget(self.images_container)
-        layout.addWidget(self.scroll_area)
+        scroll_area.setWidget(self.images_container)
+        self._preview_layout.insertWidget(self._preview_index, scroll_area)
+        self.scroll_area = scroll_area
+        return scroll_area
 
     def _create_action_buttons(self, layout):
         """创建突出的操作按钮区域"""
         button_frame = QFrame()
-        button_frame.setStyleSheet(f"""
-            QFrame {{
-                background: {ModernTheme.BG_SECONDARY.name()};
-                border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS}px;
-                padding: {ModernTheme.SPACING_MD}px;
-            }}
-        """)
+        button_frame.setObjectName("buttonBar")
         
         btn_layout = QHBoxLayout(button_frame)
         btn_layout.setContentsMargins(ModernTheme.SPACING_MD, ModernTheme.SPACING_SM, 
@@ -441,18 +665,21 @@ class FeedbackUI(QMainWindow):
 
         # 添加图片按钮
         upload_btn = QPushButton("📷 添加图片")
-        upload_btn.setStyleSheet(ComponentStyles.modern_button("secondary", "medium"))
+        upload_btn.setProperty("variant", "secondary")
+        upload_btn.setProperty("size", "medium")
         upload_btn.clicked.connect(self._on_add_images)
 
         # 提交按钮 - 突出显示
         submit_btn = QPushButton("🚀 提交反馈")
-        submit_btn.setStyleSheet(ComponentStyles.modern_button("primary", "large"))
+        submit_btn.setProperty("variant", "primary")
+        submit_btn.setProperty("size", "large")
         submit_btn.clicked.connect(self._submit_feedback)
         submit_btn.setDefault(True)  # 设为默认按钮
 
         # 取消按钮
         cancel_btn = QPushButton("❌ 取消")
-        cancel_btn.setStyleSheet(ComponentStyles.modern_button("secondary", "medium"))
+        cancel_btn.setProperty("variant", "secondary")
+        cancel_btn.setProperty("size", "medium")
         cancel_btn.clicked.connect(self.close)
 
         btn_layout.addWidget(upload_btn)
@@ -465,32 +692,18 @@ class FeedbackUI(QMainWindow):
     def _create_status_area(self, layout):
         """创建紧凑的状态栏"""
         status_frame = QFrame()
-        status_frame.setStyleSheet(f"""
-            QFrame {{
-                background: transparent;
-                border-top: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
-                padding-top: {ModernTheme.SPACING_SM}px;
-            }}
-        """)
+        status_frame.setObjectName("statusBar")
         
         status_layout = QHBoxLayout(status_frame)
         status_layout.setContentsMargins(0, ModernTheme.SPACING_SM, 0, 0)
         
         # 快捷键提示
         shortcuts_label = QLabel("💡 Ctrl+Enter 提交 | Cmd+/- 字体 | Esc 取消")
-        shortcuts_label.setStyleSheet(f"""
-            color: {ModernTheme.TEXT_MUTED.name()};
-            font-size: 11px;
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-        """)
+        shortcuts_label.setObjectName("shortcutsLabel")
         
         # 版权信息
         credit_label = QLabel("Enhanced by Cursor AI")
-        credit_label.setStyleSheet(f"""
-            color: {ModernTheme.TEXT_MUTED.name()};
-            font-size: 10px;
-            font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-        """)
+        credit_label.setObjectName("creditLabel")
         
         status_layout.addWidget(shortcuts_label)
         status_layout.addStretch()
@@ -502,45 +715,35 @@ class FeedbackUI(QMainWindow):
     # Shortcuts and Event Handling
     # ------------------------------------------------------------------
     def _setup_shortcuts(self):
-        """设置快捷键"""
-        # 字体缩放
-        zoom_in = QAction(self)
-        zoom_in.setShortcuts([QKeySequence("Ctrl+="), QKeySequence("Ctrl++")])
-        zoom_in.triggered.connect(lambda: self._adjust_font(1.1))
-        self.addAction(zoom_in)
-        
-        zoom_out = QAction(self)
-        zoom_out.setShortcut(QKeySequence("Ctrl+-"))
-        zoom_out.triggered.connect(lambda: self._adjust_font(0.9))
-        self.addAction(zoom_out)
-        
-        reset_zoom = QAction(self)
-        reset_zoom.setShortcut(QKeySequence("Ctrl+0"))
-        reset_zoom.triggered.connect(lambda: self._adjust_font(reset=True))
-        self.addAction(reset_zoom)
-
-        # 窗口控制
-        for seq in ["Esc", "Ctrl+W", "Meta+W"]:
-            close_action = QAction(self)
-            close_action.setShortcut(QKeySequence(seq))
-            close_action.triggered.connect(self.close)
-            self.addAction(close_action)
-            
-        for seq in ["Ctrl+Q", "Meta+Q"]:
-            quit_action = QAction(self)
-            quit_action.setShortcut(QKeySequence(seq))
-            quit_action.triggered.connect(QApplication.instance().quit)
-            self.addAction(quit_action)
+        """设置快捷键 – 每个命令一个 QAction，多个按键通过 setShortcuts 绑定"""
+        shortcuts = (
+            # 字体缩放
+            (("Ctrl+=", "Ctrl++"), lambda: self._adjust_font(1.1)),
+            (("Ctrl+-",), lambda: self._adjust_font(0.9)),
+            (("Ctrl+0",), lambda: self._adjust_font(reset=True)),
+            # 窗口控制
+            (("Esc", "Ctrl+W", "Meta+W"), self.close),
+            (("Ctrl+Q", "Meta+Q"), self._quit_application),
+            # 提交 (Return 为主键盘回车，Enter 为小键盘回车，二者键码不同)
+            (("Ctrl+Return", "Meta+Return", "Ctrl+Enter", "Meta+Enter"), self._submit_feedback),
+        )
+        for sequences, slot in shortcuts:
+            action = QAction(self)
+            action.setShortcuts([QKeySequence(seq) for seq in sequences])
+            action.triggered.connect(slot)
+            self.addAction(action)
 
-        # 提交快捷键
-        for seq in ["Ctrl+Return", "Meta+Return", "Ctrl+Enter", "Meta+Enter"]:
-            submit_shortcut = QShortcut(QKeySequence(seq), self)
-            submit_shortcut.activated.connect(self._submit_feedback)
+    def _quit_application(self):
+        """退出 – 先关闭窗口 (closeEvent 结束 run() 的局部事件循环)，再通知应用退出
+
+        QApplication.quit() 只作用于正在运行的 app.exec()，到不了 run() 的局部循环。
+        """
+        self.close()
+        QApplication.quit()
 
     def _adjust_font(self, factor: float = 1.0, reset: bool = False):
-        """调整界面字体大小"""
-        app = QApplication.instance()
-        current_font = app.font()
+        """调整界面字体大小 – 只作用于本窗口的控件树，不触发整个应用重新布局"""
+        current_font = self.font()
         
         if reset:
             # 重置为默认字体大小
@@ -550,29 +753,24 @@ class FeedbackUI(QMainWindow):
             new_size = max(8, min(24, int(current_size * factor)))
             current_font.setPointSize(new_size)
         
-        app.setFont(current_font)
+        self.setFont(current_font)
 
     def _submit_feedback(self):
         """提交反馈"""
         feedback_text = self.feedback_text.toPlainText().strip()
         
-        # 收集选中的选项
-        selected_options = []
-        for cb in self.option_checkboxes:
-            if cb.isChecked():
-                selected_options.append(cb.text())
-        
-        # 组合反馈内容
-        if selected_options:
-            options_text = "选择的选项:\n" + "\n".join(f"✓ {opt}" for opt in selected_options)
-            if feedback_text:
-                feedback_text = f"{options_text}\n\n详细反馈:\n{feedback_text}"
-            else:
-                feedback_text = options_text
+        # 收集选中的选项并组合反馈内容 (没有预设选项时不会创建复选框)
+        if self.predefined_options:
+            selected = "\n".join(f"✓ {cb.text()}" for cb in self.option_checkboxes if cb.isChecked())
+            if selected:
+                options_text = f"选择的选项:\n{selected}"
+                if feedback_text:
+                    feedback_text = f"{options_text}\n\n详细反馈:\n{feedback_text}"
+                else:
+                    feedback_text = options_text
         
-        # 获取图片数据
-        image_data = self.feedback_text.get_image_data()
-        image_b64_list = [img["base64"] for img in image_data]
+        # 获取图片数据 (只读，无需复制列表)
+        image_b64_list = [img["base64"] for img in self.feedback_text.image_data]
         
         # 保存结果
         self.feedback_result = {
@@ -583,9 +781,13 @@ class FeedbackUI(QMainWindow):
         self.close()
 
     def run(self):
-        """运行UI并返回结果"""
+        """运行UI并返回结果 – 只阻塞到本窗口关闭，不重入应用主事件循环"""
         self.show()
-        QApplication.instance().exec()
+        self._event_loop = QEventLoop()
+        try:
+            self._event_loop.exec()
+        finally:
+            self._event_loop = None
         return self.feedback_result
 
     def _restore_window_state(self):
@@ -616,85 +818,72 @@ class FeedbackUI(QMainWindow):
         self.settings.endGroup()
         
         event.accept()
+        
+        # 结束 run() 中的局部事件循环
+        if self._event_loop is not None:
+            self._event_loop.quit()
 
-    def _on_image_pasted(self, pixmap: QPixmap):
-        """处理图片粘贴事件"""
+    def _on_image_pasted(self, image: QImage, record: dict[str, str] | None = None):
+        """处理图片粘贴事件 – *record* 缺省时为刚追加到 image_data 的那一项"""
+        if record is None:
+            record = self.feedback_text.image_data[-1]
+        scroll_area = self._ensure_image_preview_area()
+        
         # 创建图片预览框架
         image_frame = QFrame()
         image_frame.setFixedSize(80, 80)
-        image_frame.setStyleSheet(f"""
-            QFrame {{
-                background: {ModernTheme.BG_TERTIARY.name()};
-                border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
-                border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-                padding: 4px;
-            }}
-            QFrame:hover {{
-                border-color: {ModernTheme.BORDER_HOVER.name()};
-            }}
-        """)
+        image_frame.setObjectName("imageFrame")
         
         # 图片布局
         frame_layout = QVBoxLayout(image_frame)
         frame_layout.setContentsMargins(4, 4, 4, 4)
         frame_layout.setSpacing(2)
         
-        # 缩放图片
-        scaled_pixmap = pixmap.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # 缩放图片 – 64px 缩略图用最近邻即可，大图上比平滑滤波快数倍；
+        # 按图片内容缓存，重复添加同一张图时直接复用
+        cache_key = f"if_ui/thumb/{hash(record['base64']):x}"
+        scaled_pixmap = QPixmapCache.find(cache_key)
+        if scaled_pixmap is None or scaled_pixmap.isNull():
+            # 只把 64px 缩略图转成 QPixmap，原图始终留在 QImage
+            scaled_pixmap = QPixmap.fromImage(image.scaled(64, 64, Qt.KeepAspectRatio, Qt.FastTransformation))
+            QPixmapCache.insert(cache_key, scaled_pixmap)
         
         # 图片标签
         image_label = QLabel()
         image_label.setPixmap(scaled_pixmap)
         image_label.setAlignment(Qt.AlignCenter)
-        image_label.setStyleSheet("border: none; background: transparent;")
         
         # 删除按钮
         delete_btn = QToolButton()
         delete_btn.setText("🗑️")
-        delete_btn.setStyleSheet(f"""
-            QToolButton {{
-                background: {ModernTheme.ERROR.name()};
-                color: white;
-                border: none;
-                border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-                font-size: 10px;
-                max-width: 20px;
-                max-height: 16px;
-            }}
-            QToolButton:hover {{
-                background: {ModernTheme.ERROR.darker(120).name()};
-            }}
-        """)
+        delete_btn.setObjectName("deleteImageButton")
         delete_btn.clicked.connect(lambda: self._delete_image_frame(image_frame))
         
         frame_layout.addWidget(image_label)
         frame_layout.addWidget(delete_btn)
         
         # 添加到图片容器
-        self.image_frames.append(image_frame)
+        self.image_records[image_frame] = record
         self.images_layout.insertWidget(self.images_layout.count() - 1, image_frame)
         
         # 显示图片预览区域
-        self.scroll_area.setVisible(True)
+        scroll_area.setVisible(True)
 
     def _delete_image_frame(self, frame: QFrame):
         """删除图片预览框架"""
-        if frame in self.image_frames:
+        record = self.image_records.pop(frame, None)
+        if record is not None:
             # 从UI中移除
             self.images_layout.removeWidget(frame)
             frame.deleteLater()
             
-            # 从列表中移除
-            frame_index = self.image_frames.index(frame)
-            self.image_frames.remove(frame)
-            
-            # 从图片数据中移除对应项
-            if frame_index < len(self.feedback_text.image_data):
-                self.feedback_text.image_data.pop(frame_index)
+            # 从图片数据中移除对应项 (按记录本身而非下标，粘贴与上传交错也不会错位)
+            self.feedback_text.remove_image(record)
             
             # 如果没有图片了，隐藏预览区域
-            if not self.image_frames:
-                self.scroll_area.setVisible(False)
+            scroll_area = self.scroll_area
+            if not self.image_records and scroll_area is not None:
+                scroll_area.setVisible(False)
 
     def _on_add_images(self):
         """通过文件对话框添加图片"""
@@ -704,38 +893,29 @@ class FeedbackUI(QMainWindow):
             "",
             "图片文件 (*.png *.jpg *.jpeg *.gif *.bmp *.webp);;所有文件 (*)"
         )
-        
-        for file_path in file_paths:
-            try:
-                pixmap = QPixmap(file_path)
-                if not pixmap.isNull():
-                    # 转换为Base64并添加到图片数据
-                    import base64
-                    from PySide6.QtCore import QBuffer, QIODevice
-                    
-                    buffer = QBuffer()
-                    buffer.open(QIODevice.WriteOnly)
-                    pixmap.save(buffer, "PNG")
-                    
-                    b64_data = base64.b64encode(buffer.data()).decode('utf-8')
-                    filename = __import__("os").path.basename(file_path)
-                    
-                    self.feedback_text.image_data.append({
-                        'base64': b64_data,
-                        'filename': filename
-                    })
-                    
-                    # 触发图片预览
-                    self._on_image_pasted(pixmap)
-                    
-            except Exception as e:
-                print(f"加载图片失败 {file_path}: {e}")
+        if not file_paths:
+            return
+        
+        # 解码/编码放到线程池，完成后回到 GUI 线程添加预览；
+        # 结果经批次按选择顺序交付，发给模型的图片顺序与用户选择一致
+        pool = QThreadPool.globalInstance()
+        batch = _ImageLoadBatch(len(file_paths))
+        for index, file_path in enumerate(file_paths):
+            worker = _ImageLoadWorker(file_path, batch, index)
+            worker.signals.loaded.connect(self._on_image_loaded)
+            pool.start(worker)
+
+    def _on_image_loaded(self, batch: _ImageLoadBatch, index: int, record: dict[str, str] | None, thumbnail: QImage):
+        """后台加载完成的图片 – 按选择顺序记录数据并添加预览"""
+        result = (record, thumbnail) if record is not None else None
+        for ready in batch.set_result(index, result):
+            if ready is not None:
+                self.feedback_text.add_image(ready[0])
+                self._on_image_pasted(ready[1], ready[0])
 
 
 def run_ui(prompt: str, predefined_options: Optional[List[str]] | None = None):
     """运行现代化UI界面"""
-    import sys
-    
     # 创建应用程序（如果不存在）
     app = QApplication.instance()
     if app is None:
@@ -746,29 +926,19 @@ def run_ui(prompt: str, predefined_options: Optional[List[str]] | None = None):
     app.setApplicationVersion("2.0")
     app.setOrganizationName("InteractiveFeedbackMCP")
     
-    # 启用高DPI支持
-    app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    app.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
-    
     # 应用暗色主题
     app.setPalette(get_dark_mode_palette(app))
     
+    # 缩略图缓存上限 (KB)
+    QPixmapCache.setCacheLimit(16 * 1024)
+    
     # 设置全局字体
-    font = QFont("-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif")
+    font = QFont(_base_font())
     font.setPointSize(13)
     app.setFont(font)
     
     # 设置全局样式表
-    app.setStyleSheet(f"""
-        QToolTip {{
-            background-color: {ModernTheme.BG_TERTIARY.name()};
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
-            border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-            padding: 4px;
-            font-size: 12px;
-        }}
-    """)
+    app.setStyleSheet(_app_qss())
     
     # 创建并运行UI
     ui = FeedbackUI(prompt, predefined_options)
@@ -783,7 +953,6 @@ FeedbackUI = FeedbackUI  # type: ignore
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
     import argparse
-    import sys
 
     parser = argparse.ArgumentParser(description="Interactive Feedback UI")
     parser.add_argument("--prompt", default="我已经根据您的请求完成了修改。", help="Prompt text displayed to the user")
@@ -792,14 +961,11 @@ if __name__ == "__main__":
 
     options = [opt for opt in args.predefined_options.split("|||") if opt] if args.predefined_options else None
 
-    # Ensure High DPI attributes (apply *before* QApplication instance)
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
-    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
-
     app = QApplication(sys.argv)
     app.setPalette(get_dark_mode_palette(app))
     app.setStyle("Fusion")
-    default_font = app.font()
+    app.setStyleSheet(_app_qss())
+    default_font = QFont(_base_font())
     default_font.setPointSize(15)
     app.setFont(default_font)
 
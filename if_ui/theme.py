@@ -1,11 +1,22 @@
 """现代化主题和样式系统 for Interactive Feedback UI."""
 from __future__ import annotations
 
-from PySide6.QtWidgets import QApplication
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from PySide6.QtGui import QPalette, QColor
-from PySide6.QtCore import Qt
 
-__all__ = ["get_dark_mode_palette", "ModernTheme", "ComponentStyles"]
+if TYPE_CHECKING:  # pragma: no cover
+    from PySide6.QtWidgets import QApplication  # 仅用于注解，不拉起 QtWidgets
+
+__all__ = [
+    "get_dark_mode_palette",
+    "reset_dark_mode_palette_cache",
+    "ModernTheme",
+    "ComponentStyles",
+    "THEME_QSS",
+    "rebuild_theme_qss",
+]
 
 
 class ModernTheme:
@@ -43,6 +54,34 @@ class ModernTheme:
     WARNING = QColor(251, 191, 36)         # 警告黄色
     ERROR = QColor(239, 68, 68)            # 错误红色
     
+    # 十六进制字符串 - 样式表模板直接插入，无需每次调用 QColor.name()
+    PRIMARY_HEX = PRIMARY.name()
+    PRIMARY_DARKER_HEX = PRIMARY.darker(110).name()        # 按钮渐变终点
+    PRIMARY_HOVER_HEX = PRIMARY_HOVER.name()
+    PRIMARY_HOVER_DARKER_HEX = PRIMARY_HOVER.darker(110).name()
+    PRIMARY_PRESSED_HEX = PRIMARY_PRESSED.name()
+    SECONDARY_HEX = SECONDARY.name()
+    SECONDARY_DARKER_HEX = SECONDARY.darker(110).name()
+    SECONDARY_HOVER_HEX = SECONDARY_HOVER.name()
+    SECONDARY_HOVER_DARKER_HEX = SECONDARY_HOVER.darker(110).name()
+    SECONDARY_PRESSED_HEX = SECONDARY_PRESSED.name()
+    BG_PRIMARY_HEX = BG_PRIMARY.name()
+    BG_PRIMARY_DARKER_HEX = BG_PRIMARY.darker(120).name()
+    BG_SECONDARY_HEX = BG_SECONDARY.name()
+    BG_TERTIARY_HEX = BG_TERTIARY.name()
+    BG_CARD_HEX = BG_CARD.name()
+    BG_CARD_LIGHTER_HEX = BG_CARD.lighter(105).name()      # 文本框聚焦背景
+    TEXT_PRIMARY_HEX = TEXT_PRIMARY.name()
+    TEXT_SECONDARY_HEX = TEXT_SECONDARY.name()
+    TEXT_MUTED_HEX = TEXT_MUTED.name()
+    TEXT_PLACEHOLDER_HEX = TEXT_PLACEHOLDER.name()
+    BORDER_DEFAULT_HEX = BORDER_DEFAULT.name()
+    BORDER_FOCUS_HEX = BORDER_FOCUS.name()
+    BORDER_HOVER_HEX = BORDER_HOVER.name()
+    SUCCESS_HEX = SUCCESS.name()
+    WARNING_HEX = WARNING.name()
+    ERROR_HEX = ERROR.name()
+    
     # 设计常量 - 重新平衡间距，突出主要功能
     BORDER_RADIUS = 8
     BORDER_RADIUS_SMALL = 4
@@ -65,19 +104,23 @@ class ModernTheme:
 
 
 class ComponentStyles:
-    """组件样式集合"""
+    """组件样式集合
+
+    每个方法都是参数的纯函数 (ModernTheme 为静态常量)，结果按参数缓存。
+    """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def modern_button(color_type="primary", size="medium"):
         """现代化按钮样式"""
         if color_type == "primary":
-            bg_color = ModernTheme.PRIMARY.name()
-            hover_color = ModernTheme.PRIMARY_HOVER.name()
-            pressed_color = ModernTheme.PRIMARY_PRESSED.name()
+            bg_color, bg_end = ModernTheme.PRIMARY_HEX, ModernTheme.PRIMARY_DARKER_HEX
+            hover_color, hover_end = ModernTheme.PRIMARY_HOVER_HEX, ModernTheme.PRIMARY_HOVER_DARKER_HEX
+            pressed_color = ModernTheme.PRIMARY_PRESSED_HEX
         else:  # secondary
-            bg_color = ModernTheme.SECONDARY.name()
-            hover_color = ModernTheme.SECONDARY_HOVER.name()
-            pressed_color = ModernTheme.SECONDARY_PRESSED.name()
+            bg_color, bg_end = ModernTheme.SECONDARY_HEX, ModernTheme.SECONDARY_DARKER_HEX
+            hover_color, hover_end = ModernTheme.SECONDARY_HOVER_HEX, ModernTheme.SECONDARY_HOVER_DARKER_HEX
+            pressed_color = ModernTheme.SECONDARY_PRESSED_HEX
         
         padding = "10px 20px" if size == "large" else "8px 16px"
         font_size = "14px" if size == "large" else "13px"
@@ -86,80 +129,79 @@ class ComponentStyles:
         QPushButton {{
             background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
                                       stop: 0 {bg_color}, 
-                                      stop: 1 {QColor(bg_color).darker(110).name()});
+                                      stop: 1 {bg_end});
             color: white;
             border: none;
             border-radius: {ModernTheme.BORDER_RADIUS}px;
             padding: {padding};
             font-size: {font_size};
             font-weight: 500;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
         }}
         QPushButton:hover {{
             background: qlineargradient(x1: 0, y1: 0, x2: 0, y2: 1,
                                       stop: 0 {hover_color}, 
-                                      stop: 1 {QColor(hover_color).darker(110).name()});
+                                      stop: 1 {hover_end});
         }}
         QPushButton:pressed {{
             background: {pressed_color};
         }}
         QPushButton:disabled {{
-            background: {ModernTheme.BG_TERTIARY.name()};
-            color: {ModernTheme.TEXT_MUTED.name()};
+            background: {ModernTheme.BG_TERTIARY_HEX};
+            color: {ModernTheme.TEXT_MUTED_HEX};
         }}
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def modern_text_edit():
         """现代化文本编辑器样式"""
         return f"""
         QTextEdit {{
-            background-color: {ModernTheme.BG_CARD.name()};
-            border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
+            background-color: {ModernTheme.BG_CARD_HEX};
+            border: 2px solid {ModernTheme.BORDER_DEFAULT_HEX};
             border-radius: {ModernTheme.BORDER_RADIUS}px;
             padding: {ModernTheme.SPACING_MD}px;
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, monospace;
+            color: {ModernTheme.TEXT_PRIMARY_HEX};
             font-size: 14px;
             line-height: 1.5;
-            selection-background-color: {ModernTheme.PRIMARY.name()};
+            selection-background-color: {ModernTheme.PRIMARY_HEX};
         }}
         QTextEdit:focus {{
-            border-color: {ModernTheme.BORDER_FOCUS.name()};
-            background-color: {ModernTheme.BG_CARD.lighter(105).name()};
+            border-color: {ModernTheme.BORDER_FOCUS_HEX};
+            background-color: {ModernTheme.BG_CARD_LIGHTER_HEX};
         }}
         QTextEdit:hover {{
-            border-color: {ModernTheme.BORDER_HOVER.name()};
+            border-color: {ModernTheme.BORDER_HOVER_HEX};
         }}
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def modern_text_browser():
         """现代化文本浏览器样式"""
         return f"""
         QTextBrowser {{
-            background-color: {ModernTheme.BG_SECONDARY.name()};
-            border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+            background-color: {ModernTheme.BG_SECONDARY_HEX};
+            border: 1px solid {ModernTheme.BORDER_DEFAULT_HEX};
             border-radius: {ModernTheme.BORDER_RADIUS}px;
             padding: {ModernTheme.SPACING_MD}px;
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            color: {ModernTheme.TEXT_PRIMARY_HEX};
             font-size: 14px;
             line-height: 1.6;
-            selection-background-color: {ModernTheme.PRIMARY.name()};
+            selection-background-color: {ModernTheme.PRIMARY_HEX};
         }}
         QTextBrowser:focus {{
-            border-color: {ModernTheme.BORDER_FOCUS.name()};
+            border-color: {ModernTheme.BORDER_FOCUS_HEX};
         }}
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def modern_checkbox():
         """现代化复选框样式 - 适合垂直排列"""
         return f"""
         QCheckBox {{
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            color: {ModernTheme.TEXT_PRIMARY_HEX};
             font-size: 14px;
             font-weight: 500;
             spacing: {ModernTheme.SPACING_SM}px;
@@ -169,17 +211,17 @@ class ComponentStyles:
             width: 16px;
             height: 16px;
             border-radius: {ModernTheme.BORDER_RADIUS_SMALL}px;
-            border: 2px solid {ModernTheme.BORDER_DEFAULT.name()};
-            background: {ModernTheme.BG_CARD.name()};
+            border: 2px solid {ModernTheme.BORDER_DEFAULT_HEX};
+            background: {ModernTheme.BG_CARD_HEX};
             margin-right: {ModernTheme.SPACING_SM}px;
         }}
         QCheckBox::indicator:hover {{
-            border-color: {ModernTheme.BORDER_HOVER.name()};
-            background: {ModernTheme.BG_TERTIARY.name()};
+            border-color: {ModernTheme.BORDER_HOVER_HEX};
+            background: {ModernTheme.BG_TERTIARY_HEX};
         }}
         QCheckBox::indicator:checked {{
-            background: {ModernTheme.PRIMARY.name()};
-            border-color: {ModernTheme.PRIMARY.name()};
+            background: {ModernTheme.PRIMARY_HEX};
+            border-color: {ModernTheme.PRIMARY_HEX};
             image: none;
         }}
         QCheckBox::indicator:checked::after {{
@@ -193,29 +235,30 @@ class ComponentStyles:
         """
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def modern_group_box():
         """现代化组框样式 - 零边距版本"""
         return f"""
         QGroupBox {{
             font-size: 13px;
             font-weight: 600;
-            color: {ModernTheme.TEXT_PRIMARY.name()};
-            border: 1px solid {ModernTheme.BORDER_DEFAULT.name()};
+            color: {ModernTheme.TEXT_PRIMARY_HEX};
+            border: 1px solid {ModernTheme.BORDER_DEFAULT_HEX};
             border-radius: {ModernTheme.BORDER_RADIUS}px;
             margin-top: 0px;  /* 完全移除顶部边距 */
             margin-bottom: 0px;  /* 移除底部边距 */
-            background: {ModernTheme.BG_CARD.name()};
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: {ModernTheme.BG_CARD_HEX};
         }}
         QGroupBox::title {{
             subcontrol-origin: margin;
             left: 8px;
             padding: 0 4px 0 4px;  /* 减小标题padding */
-            background: {ModernTheme.BG_CARD.name()};
+            background: {ModernTheme.BG_CARD_HEX};
         }}
         """
     
-    @staticmethod 
+    @staticmethod
+    @lru_cache(maxsize=None)
     def modern_scroll_area():
         """现代化滚动区域样式"""
         return f"""
@@ -225,66 +268,140 @@ class ComponentStyles:
         }}
         QScrollBar:horizontal {{
             height: 8px;
-            background: {ModernTheme.BG_TERTIARY.name()};
+            background: {ModernTheme.BG_TERTIARY_HEX};
             border-radius: 4px;
             margin: 0px;
         }}
         QScrollBar::handle:horizontal {{
-            background: {ModernTheme.SECONDARY.name()};
+            background: {ModernTheme.SECONDARY_HEX};
             border-radius: 4px;
             min-width: 20px;
         }}
         QScrollBar::handle:horizontal:hover {{
-            background: {ModernTheme.SECONDARY_HOVER.name()};
+            background: {ModernTheme.SECONDARY_HOVER_HEX};
         }}
         QScrollBar::add-line:horizontal, QScrollBar::sub-line:horizontal {{
             width: 0px;
         }}
         QScrollBar:vertical {{
             width: 8px;
-            background: {ModernTheme.BG_TERTIARY.name()};
+            background: {ModernTheme.BG_TERTIARY_HEX};
             border-radius: 4px;
             margin: 0px;
         }}
         QScrollBar::handle:vertical {{
-            background: {ModernTheme.SECONDARY.name()};
+            background: {ModernTheme.SECONDARY_HEX};
             border-radius: 4px;
             min-height: 20px;
         }}
         QScrollBar::handle:vertical:hover {{
-            background: {ModernTheme.SECONDARY_HOVER.name()};
+            background: {ModernTheme.SECONDARY_HOVER_HEX};
         }}
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
             height: 0px;
         }}
         """
 
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def build_global_qss():
+        """合并界面实际使用的组件样式为一份应用级样式表 (app.setStyleSheet 一次即可)
+
+        按钮变体用动态属性选择: setProperty("variant", "primary"/"secondary")
+        与 setProperty("size", "medium"/"large")。文本浏览器与滚动区域的规则
+        限定到 #description / #imageScroll，不影响其他控件及其滚动条。
+        """
+        buttons = "".join(
+            ComponentStyles.modern_button(variant, size).replace(
+                "QPushButton", f'QPushButton[variant="{variant}"][size="{size}"]'
+            )
+            for variant in ("primary", "secondary")
+            for size in ("medium", "large")
+        )
+        text_browser = ComponentStyles.modern_text_browser().replace("QTextBrowser", "QTextBrowser#description")
+        scroll_area = (
+            ComponentStyles.modern_scroll_area()
+            .replace("QScrollBar", "QScrollArea#imageScroll QScrollBar")
+            .replace("QScrollArea {", "QScrollArea#imageScroll {")
+        )
+        return "".join((buttons, text_browser, scroll_area))
+
+
+# 调色板用到的派生颜色，模块加载时算好一次
+_BG_PRIMARY_DARK = ModernTheme.BG_PRIMARY.darker(120)
+_BLACK = QColor(0, 0, 0)
+
+# 暗色调色板定义: (颜色组 | None 表示所有组, 角色, 颜色)，使用 ModernTheme 的颜色
+_DARK_PALETTE_SPEC: tuple[tuple[QPalette.ColorGroup | None, QPalette.ColorRole, QColor], ...] = (
+    (None, QPalette.Window, ModernTheme.BG_PRIMARY),
+    (None, QPalette.WindowText, ModernTheme.TEXT_PRIMARY),
+    (QPalette.Disabled, QPalette.WindowText, ModernTheme.TEXT_MUTED),
+    (None, QPalette.Base, ModernTheme.BG_CARD),
+    (None, QPalette.AlternateBase, ModernTheme.BG_SECONDARY),
+    (None, QPalette.ToolTipBase, ModernTheme.BG_TERTIARY),
+    (None, QPalette.ToolTipText, ModernTheme.TEXT_PRIMARY),
+    (None, QPalette.Text, ModernTheme.TEXT_PRIMARY),
+    (QPalette.Disabled, QPalette.Text, ModernTheme.TEXT_MUTED),
+    (None, QPalette.Dark, _BG_PRIMARY_DARK),
+    (None, QPalette.Shadow, _BLACK),
+    (None, QPalette.Button, ModernTheme.BG_TERTIARY),
+    (None, QPalette.ButtonText, ModernTheme.TEXT_PRIMARY),
+    (QPalette.Disabled, QPalette.ButtonText, ModernTheme.TEXT_MUTED),
+    (None, QPalette.BrightText, ModernTheme.ERROR),
+    (None, QPalette.Link, ModernTheme.PRIMARY),
+    (None, QPalette.Highlight, ModernTheme.PRIMARY),
+    (QPalette.Disabled, QPalette.Highlight, ModernTheme.BG_TERTIARY),
+    (None, QPalette.HighlightedText, ModernTheme.TEXT_PRIMARY),
+    (QPalette.Disabled, QPalette.HighlightedText, ModernTheme.TEXT_MUTED),
+    (None, QPalette.PlaceholderText, ModernTheme.TEXT_PLACEHOLDER),
+)
+
+# 已构建的暗色调色板，按基础调色板的 cacheKey() 缓存 (id() 对临时包装对象不可靠)
+_dark_palette_cache: dict[int, QPalette] = {}
+
+
+def reset_dark_mode_palette_cache() -> None:
+    """基础样式/调色板改变后清空暗色调色板缓存"""
+    _dark_palette_cache.clear()
+
 
 def get_dark_mode_palette(app: QApplication) -> QPalette:
     """返回现代化的暗色主题调色板"""
-    dark_palette = app.palette()
+    base_palette = app.palette()
+    cached = _dark_palette_cache.get(base_palette.cacheKey())
+    if cached is not None:
+        # QPalette 隐式共享，复制只增加引用计数
+        return QPalette(cached)
+
+    dark_palette = QPalette(base_palette)
     
-    # 使用 ModernTheme 的颜色
-    dark_palette.setColor(QPalette.Window, ModernTheme.BG_PRIMARY)
-    dark_palette.setColor(QPalette.WindowText, ModernTheme.TEXT_PRIMARY)
-    dark_palette.setColor(QPalette.Disabled, QPalette.WindowText, ModernTheme.TEXT_MUTED)
-    dark_palette.setColor(QPalette.Base, ModernTheme.BG_CARD)
-    dark_palette.setColor(QPalette.AlternateBase, ModernTheme.BG_SECONDARY)
-    dark_palette.setColor(QPalette.ToolTipBase, ModernTheme.BG_TERTIARY)
-    dark_palette.setColor(QPalette.ToolTipText, ModernTheme.TEXT_PRIMARY)
-    dark_palette.setColor(QPalette.Text, ModernTheme.TEXT_PRIMARY)
-    dark_palette.setColor(QPalette.Disabled, QPalette.Text, ModernTheme.TEXT_MUTED)
-    dark_palette.setColor(QPalette.Dark, ModernTheme.BG_PRIMARY.darker(120))
-    dark_palette.setColor(QPalette.Shadow, QColor(0, 0, 0))
-    dark_palette.setColor(QPalette.Button, ModernTheme.BG_TERTIARY)
-    dark_palette.setColor(QPalette.ButtonText, ModernTheme.TEXT_PRIMARY)
-    dark_palette.setColor(QPalette.Disabled, QPalette.ButtonText, ModernTheme.TEXT_MUTED)
-    dark_palette.setColor(QPalette.BrightText, ModernTheme.ERROR)
-    dark_palette.setColor(QPalette.Link, ModernTheme.PRIMARY)
-    dark_palette.setColor(QPalette.Highlight, ModernTheme.PRIMARY)
-    dark_palette.setColor(QPalette.Disabled, QPalette.Highlight, ModernTheme.BG_TERTIARY)
-    dark_palette.setColor(QPalette.HighlightedText, ModernTheme.TEXT_PRIMARY)
-    dark_palette.setColor(QPalette.Disabled, QPalette.HighlightedText, ModernTheme.TEXT_MUTED)
-    dark_palette.setColor(QPalette.PlaceholderText, ModernTheme.TEXT_PLACEHOLDER)
+    for group, role, color in _DARK_PALETTE_SPEC:
+        if group is None:
+            dark_palette.setColor(role, color)
+        else:
+            dark_palette.setColor(group, role, color)
     
-    return dark_palette
+    _dark_palette_cache[base_palette.cacheKey()] = dark_palette
+    return QPalette(dark_palette)
+
+
+# 主题颜色都是常量，应用级样式表实际上是个字面量：导入时生成一次
+THEME_QSS: str = ComponentStyles.build_global_qss()
+
+
+def rebuild_theme_qss() -> str:
+    """ModernTheme 的 *_HEX 常量被修改后 (如热重载) 清空样式缓存并重新生成 THEME_QSS
+
+    调用方随后用 app.setStyleSheet(...) 重新应用 (main.py 每次都从 THEME_QSS 拼接)。
+    """
+    global THEME_QSS
+    ComponentStyles.modern_button.cache_clear()
+    ComponentStyles.modern_text_edit.cache_clear()
+    ComponentStyles.modern_text_browser.cache_clear()
+    ComponentStyles.modern_checkbox.cache_clear()
+    ComponentStyles.modern_group_box.cache_clear()
+    ComponentStyles.modern_scroll_area.cache_clear()
+    ComponentStyles.build_global_qss.cache_clear()
+    THEME_QSS = ComponentStyles.build_global_qss()
+    return THEME_QSS
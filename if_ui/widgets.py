@@ -1,13 +1,12 @@
 """Reusable Qt widgets for Interactive Feedback UI."""
 from __future__ import annotations
 
-import base64
-import uuid
-from datetime import datetime
+import itertools
+import time
 from typing import TYPE_CHECKING, List
 
 from PySide6.QtCore import QBuffer, QIODevice, Qt, Signal
-from PySide6.QtGui import QKeyEvent, QKeySequence, QPixmap
+from PySide6.QtGui import QImage, QImageWriter, QKeyEvent, QKeySequence, QPixmap
 from PySide6.QtWidgets import QApplication, QTextEdit
 
 __all__: List[str] = ["FeedbackTextEdit"]
@@ -15,6 +14,9 @@ __all__: List[str] = ["FeedbackTextEdit"]
 if TYPE_CHECKING:  # pragma: no cover
     from .main import FeedbackUI  # Avoid runtime circular import
 
+# 与 Ctrl 组合时提交反馈的按键 (主键盘回车与小键盘 Enter)
+_SUBMIT_KEYS = frozenset((Qt.Key_Return, Qt.Key_Enter))
+
 
 class FeedbackTextEdit(QTextEdit):
     """Rich text editor supporting image paste → base64."""
@@ -22,90 +24,156 @@ class FeedbackTextEdit(QTextEdit):
     # 图片处理常量
     DEFAULT_MAX_IMAGE_WIDTH = 1624
     DEFAULT_MAX_IMAGE_HEIGHT = 1624
-    DEFAULT_IMAGE_FORMAT = "PNG"
+    DEFAULT_IMAGE_FORMAT = "WEBP"
+    DEFAULT_IMAGE_QUALITY = 85
+    FALLBACK_IMAGE_FORMAT = "PNG"  # 缺少 WebP 插件时使用
+
+    # 当用户粘贴图片时发射 (已缩放的) QImage
+    image_pasted: Signal = Signal(QImage)
+
+    # 设备像素比，所有实例共享 (首次使用时查询)
+    _dpr: float | None = None
+    # QImageWriter 支持的格式 (小写)，首次编码时查询
+    _writable_formats: frozenset[str] | None = None
+    # 粘贴文件名序号，与纳秒时间戳一起保证唯一 (无需 uuid/strftime)
+    _paste_counter = itertools.count()
 
-    # 当用户粘贴图片时发射 pixmap
-    image_pasted: Signal = Signal(QPixmap)
+    # 图片压缩/保存参数 – 放在类上，实例只在被单独赋值时才占用 __dict__
+    # (QObject 子类不能真正使用 __slots__)
+    max_image_width: int = DEFAULT_MAX_IMAGE_WIDTH
+    max_image_height: int = DEFAULT_MAX_IMAGE_HEIGHT
+    image_format: str = DEFAULT_IMAGE_FORMAT
+    image_quality: int = DEFAULT_IMAGE_QUALITY
 
     def __init__(self, parent=None):  # noqa: D401, ANN001
         super().__init__(parent)
         self.image_data: list[dict[str, str]] = []  # 保存图片的Base64数据列表
-        # 设备像素比，用于 Retina
-        self.device_pixel_ratio = QApplication.primaryScreen().devicePixelRatio()
-        # 图片压缩/保存参数
-        self.max_image_width = self.DEFAULT_MAX_IMAGE_WIDTH
-        self.max_image_height = self.DEFAULT_MAX_IMAGE_HEIGHT
-        self.image_format = self.DEFAULT_IMAGE_FORMAT
+        # 编码用的 QBuffer 复用于每次粘贴；Truncate 打开时保留底层 QByteArray 的容量。
+        # 只在 GUI 线程使用 (粘贴事件)，无需加锁
+        self._encode_buffer = QBuffer(self)
+        # 所属的 FeedbackUI，首次 Ctrl+Enter 时查找
+        self._feedback_ui: FeedbackUI | None = None
+
+    @property
+    def device_pixel_ratio(self) -> float:
+        """设备像素比，用于 Retina (所有实例共享)"""
+        return self._get_dpr()
+
+    @classmethod
+    def _get_dpr(cls) -> float:
+        """主屏幕的设备像素比，只查询一次"""
+        if cls._dpr is None:
+            cls._dpr = QApplication.primaryScreen().devicePixelRatio()
+        return cls._dpr
+
+    @classmethod
+    def _can_write(cls, image_format: str) -> bool:
+        """当前 Qt 是否能写出 image_format (WebP 依赖 qtimageformats 插件)"""
+        if cls._writable_formats is None:
+            cls._writable_formats = frozenset(
+                bytes(fmt).decode("ascii").lower() for fmt in QImageWriter.supportedImageFormats()
+            )
+        return image_format.lower() in cls._writable_formats
 
     # ---------------------------------------------------------------------
     # Event handling
     # ---------------------------------------------------------------------
     def keyPressEvent(self, event: QKeyEvent):  # noqa: D401, ANN001
         # Ctrl/Cmd + Enter 提交反馈
-        if event.key() == Qt.Key_Return and event.modifiers() == Qt.ControlModifier:
-            parent = self.parent()
-            # 向上寻找 FeedbackUI
-            while parent and parent.__class__.__name__ != "FeedbackUI":
-                parent = parent.parent()
-            if parent and hasattr(parent, "_submit_feedback"):
-                parent._submit_feedback()  # type: ignore[attr-defined]  # pylint: disable=protected-access
+        if event.key() in _SUBMIT_KEYS and event.modifiers() & Qt.ControlModifier:
+            owner = self._feedback_ui
+            if owner is None:
+                # 向上寻找 FeedbackUI，找到后缓存 (编辑器不会被移到其他窗口)
+                owner = self._feedback_ui = self._find_feedback_ui()
+            if owner is not None:
+                owner._submit_feedback()  # pylint: disable=protected-access
         else:
             super().keyPressEvent(event)
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
+    def _find_feedback_ui(self) -> FeedbackUI | None:
+        """向上寻找所属的 FeedbackUI (按类名比较，避免运行时循环导入)."""
+        parent = self.parent()
+        while parent and parent.__class__.__name__ != "FeedbackUI":
+            parent = parent.parent()
+        if parent and hasattr(parent, "_submit_feedback"):
+            return parent  # type: ignore[return-value]
+        return None
+
     def _convert_image_to_base64(self, image):  # noqa: D401, ANN001
-        """将 QImage/QPixmap 转为 {data, extension}."""
-        try:
-            if not isinstance(image, QPixmap):
-                pixmap = QPixmap.fromImage(image)
-            else:
-                pixmap = image
-
-            buffer = QBuffer()
-            buffer.open(QIODevice.WriteOnly)
-            pixmap.save(buffer, self.image_format)
-            byte_array = buffer.data()
-            buffer.close()
-
-            return {
-                "data": base64.b64encode(byte_array).decode("utf-8"),
-                "extension": self.image_format.lower(),
-            }
-        except Exception as exc:  # pragma: no cover
-            print(f"转换图片为Base64时出错: {exc}")
+        """将 QImage/QPixmap 转为 {data, extension, image}；image 供预览复用，避免再转换一次.
+
+        Qt 的转换/保存失败时返回 False 或空图而不是抛异常，这里逐一检查，失败返回 None。
+        """
+        # 剪贴板给出的通常已是 QImage；直接在 QImage 上缩放/编码，
+        # 省去 QPixmap 往返窗口系统的一次拷贝与回读
+        if isinstance(image, QPixmap):
+            image = image.toImage()
+        if not isinstance(image, QImage) or image.isNull():
             return None
 
+        # 超出最大尺寸时等比缩小，避免大截图产生巨大的 base64 负载
+        if image.width() > self.max_image_width or image.height() > self.max_image_height:
+            image = image.scaled(
+                self.max_image_width,
+                self.max_image_height,
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation,
+            )
+
+        # WebP 比 PNG 编码更快、体积更小，且保留透明通道；不可用时退回 PNG
+        image_format = self.image_format
+        if not self._can_write(image_format):
+            image_format = self.FALLBACK_IMAGE_FORMAT
+
+        buffer = self._encode_buffer
+        if not buffer.open(QIODevice.WriteOnly | QIODevice.Truncate):
+            print(f"转换图片为Base64时出错: {buffer.errorString()}")
+            return None
+        saved = image.save(buffer, image_format, self.image_quality)
+        buffer.close()
+        if not saved:
+            print(f"转换图片为Base64时出错: 无法编码为 {image_format}")
+            return None
+
+        return {
+            "data": bytes(buffer.data().toBase64()).decode("ascii"),
+            "extension": image_format.lower(),
+            "image": image,
+        }
+
     # ------------------------------------------------------------------
     # Paste handling (supports Retina)
     # ------------------------------------------------------------------
     def insertFromMimeData(self, source_data):  # noqa: D401, ANN001
         """捕获图片粘贴，转为 base64 并发射信号."""
+        if source_data.hasImage():
+            img_info = self._convert_image_to_base64(source_data.imageData())
+            if img_info is not None:
+                tag = f"{time.time_ns():x}_{next(self._paste_counter):x}"
+                filename = f"pasted_{tag}.{img_info['extension']}"
+                self.add_image({"base64": img_info["data"], "filename": filename, "format": img_info["extension"]})
+                self.image_pasted.emit(img_info["image"])
+                return  # 已处理
+        # Fallback to default behaviour
         try:
-            if source_data.hasImage():
-                image = source_data.imageData()
-                if image:
-                    img_info = self._convert_image_to_base64(image)
-                    if img_info:
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        unique_id = str(uuid.uuid4())[:8]
-                        filename = f"pasted_{timestamp}_{unique_id}.{img_info['extension']}"
-                        self.image_data.append({"base64": img_info["data"], "filename": filename})
-                        pixmap = image if isinstance(image, QPixmap) else QPixmap.fromImage(image)
-                        self.image_pasted.emit(pixmap)
-                        return  # 已处理
-            # Fallback to default behaviour
             super().insertFromMimeData(source_data)
-        except Exception as exc:  # pragma: no cover
+        except (RuntimeError, ValueError) as exc:  # pragma: no cover
             print(f"处理粘贴内容时出错: {exc}")
-            try:
-                super().insertFromMimeData(source_data)
-            except Exception:
-                cursor = self.textCursor()
-                cursor.insertText(f"[粘贴内容失败: {exc}]")
+            self.textCursor().insertText(f"[粘贴内容失败: {exc}]")
 
     # ------------------------------------------------------------------
+    def add_image(self, record: dict[str, str]) -> None:
+        """追加一条图片记录 {base64, filename, format}."""
+        self.image_data.append(record)
+
+    def remove_image(self, record: dict[str, str]) -> None:
+        """移除一条图片记录 (按对象本身匹配，内容相同的其他记录不受影响)."""
+        index = next(i for i, r in enumerate(self.image_data) if r is record)
+        del self.image_data[index]
+
     def get_image_data(self):  # noqa: D401
         """Return shallow copy of image_data list."""
         return self.image_data.copy()
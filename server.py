@@ -74,6 +74,16 @@ def launch_feedback_ui(summary: str, predefinedOptions: list[str] | None = None)
         # 回退：返回空反馈，避免上游崩溃
         return {"interactive_feedback": "", "images": []}
 
+def _sniff_image_format(data: bytes) -> str:
+    """按文件头识别图片格式；UI 会原样传回 JPEG/GIF/WebP 文件，无法识别时按 PNG 处理"""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return "png"
+
 @mcp.tool()
 def interactive_feedback(
     message: str = Field(description="The specific question for the user"),
@@ -93,7 +103,7 @@ def interactive_feedback(
     for b64 in img_b64_list:
         try:
             img_bytes = base64.b64decode(b64)
-            images.append(Image(data=img_bytes, format="png"))
+            images.append(Image(data=img_bytes, format=_sniff_image_format(img_bytes)))
         except Exception:
             # 若解码失败，忽略该图片并在文字中提示
             txt += f"\n\n[warning] 有一张图片解码失败。"